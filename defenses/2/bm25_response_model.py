@@ -1,16 +1,18 @@
 import os
 import json
+import numpy as np
 from rank_bm25 import BM25Okapi
 import nltk
 from nltk.tokenize import word_tokenize
 from nltk.stem import SnowballStemmer
+from corpus_store import CorpusStore
 
 nltk.download("punkt")
 
 
 class ResponseModel:
     def __init__(self, decision_tree, config_path="config.json"):
-        self.decision_tree = decision_tree
+        self.corpus = CorpusStore.ensure(decision_tree)
         # Загрузка конфигурации
         if os.path.exists(config_path):
             with open(config_path, "r") as config_file:
@@ -23,12 +25,11 @@ class ResponseModel:
         # Инициализация стеммера для русского языка
         self.stemmer = SnowballStemmer("russian")
 
-        # Подготовка данных
-        self.flat_structure, self.answers = self.flatten_tree(decision_tree)
-        self.tokenized_corpus = [
-            self.preprocess_text(text) for text in self.flat_structure
-        ]
-        self.bm25_model = BM25Okapi(self.tokenized_corpus)
+        # Подготовка данных: токенизированный корпус нужен только на время
+        # построения индекса BM25
+        self.bm25_model = BM25Okapi(
+            [self.preprocess_text(text) for text in self.corpus.documents()]
+        )
 
     def preprocess_text(self, text):
         tokens = word_tokenize(text.lower(), language="russian")
@@ -37,34 +38,17 @@ class ResponseModel:
         ]
         return stemmed_tokens
 
-    # Остальные методы остаются без изменений
-    def flatten_tree(self, node, path=""):
-        if isinstance(node, dict):
-            result = []
-            answers = []
-            for key, value in node.items():
-                new_path = f"{path} {key}" if path else key
-                flattened_result, flattened_answers = self.flatten_tree(value, new_path)
-                result.extend(flattened_result)
-                answers.extend(flattened_answers)
-            return result, answers
-        elif isinstance(node, tuple):
-            description, _ = node
-            answer = node
-            return [f"{path} {description}"], [answer]
-        else:
-            return [], []
+    def get_ranking(self, question, top_k=10):
+        scores = self.bm25_model.get_scores(self.preprocess_text(question))
+        top_indices = np.argsort(-scores, kind="stable")[:top_k]
+        return [(int(index), float(scores[index])) for index in top_indices]
 
     def get_answers(self, questions):
         results = []
         for question in questions:
-            tokenized_question = self.preprocess_text(question)
-            scores = self.bm25_model.get_scores(tokenized_question)
-            best_match_index = scores.argmax()
-            similarity_score = scores[best_match_index]
-
+            best_match_index, similarity_score = self.get_ranking(question, 1)[0]
             if similarity_score >= self.similarity_threshold:
-                results.append((self.answers[best_match_index], similarity_score))
+                results.append((self.corpus.answer(best_match_index), similarity_score))
             else:
                 results.append(
                     (
@@ -0,0 +1,119 @@
+import numpy as np
+
+
+class CorpusStore:
+    """
+    Класс CorpusStore хранит плоскую структуру дерева решений в компактном виде:
+    пути, тексты ответов и списки вложений всех листьев лежат в одном UTF-8 буфере,
+    а границы листьев задаются массивом смещений и адресуются целыми id.
+    Один экземпляр может использоваться всеми моделями ответов одновременно.
+    """
+
+    # Разделитель между путем листа и его описанием: документ для поиска имеет
+    # вид "путь описание", где путь - названия каталогов через пробел
+    SEPARATOR = b" "
+    # Разделитель между файлами-вложениями (недопустим в путях файлов)
+    FILE_SEPARATOR = b"\0"
+
+    def __init__(self, blob, offsets):
+        """
+        Инициализирует хранилище из уже подготовленных буферов.
+
+        Параметры:
+        blob: Буфер bytes, в котором для каждого листа подряд записаны путь,
+        разделитель, текст ответа и пути вложений через FILE_SEPARATOR.
+        offsets: Массив смещений длины 3 * n + 1: начало пути, начало текста
+        и начало вложений каждого листа, последний элемент - конец буфера.
+        """
+        self._blob = blob
+        self._offsets = offsets
+
+    @classmethod
+    def from_tree(cls, decision_tree):
+        """
+        Строит хранилище из дерева решений, полученного через tree_builder.
+
+        Параметры:
+        decision_tree: Дерево решений (словарь с кортежами (текст, файлы) в листьях).
+
+        Возвращает:
+        Экземпляр CorpusStore.
+        """
+        chunks = []
+        offsets = []
+        position = 0
+
+        def walk(node, path):
+            nonlocal position
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    walk(value, f"{path} {key}" if path else key)
+            elif isinstance(node, tuple):  # Если узел - это ответ
+                description, files = node
+                encoded_path = path.encode("utf-8")
+                encoded_text = description.encode("utf-8")
+                encoded_files = cls.FILE_SEPARATOR.join(
+                    file.encode("utf-8") for file in files
+                )
+                offsets.append(position)
+                offsets.append(position + len(encoded_path) + len(cls.SEPARATOR))
+                offsets.append(offsets[-1] + len(encoded_text))
+                chunks.extend(
+                    (encoded_path, cls.SEPARATOR, encoded_text, encoded_files)
+                )
+                position = offsets[-1] + len(encoded_files)
+
+        walk(decision_tree, "")
+        offsets.append(position)
+        return cls(b"".join(chunks), np.array(offsets, dtype=np.int64))
+
+    @classmethod
+    def ensure(cls, source):
+        """
+        Возвращает хранилище для источника: уже готовое хранилище используется
+        как есть, дерево решений преобразуется через from_tree.
+        """
+        return source if isinstance(source, cls) else cls.from_tree(source)
+
+    def __len__(self):
+        return len(self._offsets) // 3
+
+    def _decode(self, start, end):
+        return self._blob[start:end].decode("utf-8")
+
+    def path(self, leaf_id):
+        """Возвращает путь листа в дереве (названия каталогов через пробел)."""
+        start, text_start = self._offsets[3 * leaf_id : 3 * leaf_id + 2]
+        return self._decode(start, text_start - len(self.SEPARATOR))
+
+    def text(self, leaf_id):
+        """Возвращает текст ответа листа."""
+        return self._decode(*self._offsets[3 * leaf_id + 1 : 3 * leaf_id + 3])
+
+    def files(self, leaf_id):
+        """Возвращает список файлов-вложений листа."""
+        start, end = self._offsets[3 * leaf_id + 2 : 3 * leaf_id + 4]
+        if start == end:
+            return []
+        return [
+            file.decode("utf-8")
+            for file in self._blob[start:end].split(self.FILE_SEPARATOR)
+        ]
+
+    def document(self, leaf_id):
+        """Возвращает строку "путь описание", по которой ведется поиск."""
+        return self._decode(*self._offsets[3 * leaf_id : 3 * leaf_id + 3 : 2])
+
+    def answer(self, leaf_id):
+        """Возвращает ответ листа в формате (текст, файлы), как в дереве решений."""
+        return self.text(leaf_id), self.files(leaf_id)
+
+    def documents(self):
+        """Лениво перебирает строки "путь описание" всех листьев по порядку."""
+        for leaf_id in range(len(self)):
+            yield self.document(leaf_id)
+
+    @property
+    def nbytes(self):
+        """Объем памяти, занимаемый буфером и массивом смещений хранилища."""
+        return len(self._blob) + self._offsets.nbytes
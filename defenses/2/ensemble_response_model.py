@@ -0,0 +1,194 @@
+import time
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from corpus_store import CorpusStore
+
+# Модули моделей ответов, доступные ансамблю. Импортируются лениво, чтобы
+# не загружать torch/transformers, если плотные модели не используются.
+BACKENDS = {
+    "tfidf": "response_model",
+    "bm25": "bm25_response_model",
+    "sbert": "new_response_model",
+    "sbert_ru": "sbert_ru_response_model",
+}
+DEFAULT_BACKENDS = ("tfidf", "bm25", "sbert")
+
+
+class ResponseModel:
+    """
+    Класс ResponseModel объединяет несколько моделей ответов над одним общим корпусом.
+    Модели опрашиваются параллельно в пуле потоков (sklearn и torch отпускают GIL),
+    а их ранжированные списки объединяются методом Reciprocal Rank Fusion.
+
+    Каждая модель защищена своей блокировкой: токенизаторы HuggingFace нельзя
+    вызывать из двух потоков одновременно, поэтому при параллельных вызовах search
+    запросы к одной модели выполняются по очереди, а разные модели - параллельно.
+    """
+
+    def __init__(
+        self,
+        decision_tree,
+        config_path="config.json",
+        backends=DEFAULT_BACKENDS,
+        top_k=10,
+        fusion_k=60,
+        similarity_threshold=0.5,
+    ):
+        """
+        Инициализирует ансамбль моделей ответов.
+
+        Параметры:
+        decision_tree: Дерево решений или уже построенный CorpusStore.
+        config_path: Путь к файлу конфигурации, передается каждой модели.
+        backends: Названия моделей из BACKENDS, входящих в ансамбль.
+        top_k: Сколько лучших совпадений берется от каждой модели.
+        fusion_k: Сглаживающая константа Reciprocal Rank Fusion.
+        similarity_threshold: Порог итогового балла в [0, 1], ниже которого
+        возвращается заглушка, как и у отдельных моделей. Лист, занявший первое
+        место только у одной из трех моделей, получает не более 1/3, поэтому
+        порог 0.5 при трех моделях означает согласие хотя бы двух из них.
+        """
+        if not backends:
+            raise ValueError("Ensemble requires at least one backend.")
+        unknown = [name for name in backends if name not in BACKENDS]
+        if unknown:
+            raise ValueError(
+                f"Unknown backends {unknown}. Available: {list(BACKENDS)}."
+            )
+        # Корпус строится один раз и разделяется всеми моделями
+        self.corpus = CorpusStore.ensure(decision_tree)
+        self.top_k = top_k
+        self.fusion_k = fusion_k
+        self.similarity_threshold = similarity_threshold
+        modules = {name: importlib.import_module(BACKENDS[name]) for name in backends}
+        self.executor = ThreadPoolExecutor(
+            max_workers=len(modules), thread_name_prefix="backend"
+        )
+        try:
+            futures = {
+                name: self.executor.submit(
+                    module.ResponseModel, self.corpus, config_path
+                )
+                for name, module in modules.items()
+            }
+            self.backends = {name: future.result() for name, future in futures.items()}
+        except BaseException:
+            self.executor.shutdown(cancel_futures=True)
+            raise
+        self.locks = {name: threading.Lock() for name in self.backends}
+
+    def close(self):
+        """Останавливает пул потоков ансамбля."""
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _timed_ranking(self, name, question):
+        with self.locks[name]:
+            start = time.perf_counter()
+            ranking = self.backends[name].get_ranking(question, self.top_k)
+            return ranking, time.perf_counter() - start
+
+    def fuse(self, rankings):
+        """
+        Объединяет ранжированные списки моделей методом Reciprocal Rank Fusion.
+
+        Параметры:
+        rankings: Словарь {название модели: список пар (id листа, сходство)}.
+        Учитываются только совпадения, прошедшие порог сходства своей модели.
+
+        Возвращает:
+        Список пар (id листа, итоговый балл) по убыванию балла. Балл нормирован
+        на максимально возможную сумму len(backends) / (fusion_k + 1) и лежит
+        в [0, 1]: 1 означает первое место у всех моделей ансамбля.
+        """
+        max_score = len(self.backends) / (self.fusion_k + 1)
+        fused = {}
+        for name, ranking in rankings.items():
+            threshold = self.backends[name].similarity_threshold
+            relevant = [leaf_id for leaf_id, score in ranking if score >= threshold]
+            for rank, leaf_id in enumerate(relevant, start=1):
+                fused[leaf_id] = fused.get(leaf_id, 0.0) + 1 / (self.fusion_k + rank)
+        return sorted(
+            ((leaf_id, score / max_score) for leaf_id, score in fused.items()),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+    def search(self, question):
+        """
+        Выполняет поиск по вопросу во всех моделях ансамбля одновременно.
+        Метод можно вызывать из нескольких потоков: обращения к одной модели
+        сериализуются ее блокировкой, а задержка модели учитывает только сам поиск.
+
+        Параметры:
+        question: Вопрос пользователя.
+
+        Возвращает:
+        Кортеж (объединенный ранжированный список пар (id листа, балл в [0, 1]),
+        словарь задержек в секундах по моделям и под ключом "total").
+        """
+        start = time.perf_counter()
+        futures = {
+            name: self.executor.submit(self._timed_ranking, name, question)
+            for name in self.backends
+        }
+        rankings = {}
+        latencies = {}
+        for name, future in futures.items():
+            rankings[name], latencies[name] = future.result()
+        fused = self.fuse(rankings)
+        latencies["total"] = time.perf_counter() - start
+        return fused, latencies
+
+    def get_answers_with_latency(self, questions):
+        """
+        Получает ответы на вопросы вместе с задержками моделей ансамбля.
+
+        Параметры:
+        questions: Список вопросов, на которые нужно получить ответы.
+
+        Возвращает:
+        Список кортежей (ответ, итоговый балл в [0, 1], словарь задержек)
+        для каждого вопроса. Если ни одна модель не нашла совпадений выше своего
+        порога, балл равен 0.0.
+        """
+        results = []
+        for question in questions:
+            fused, latencies = self.search(question)
+            best_match_index, score = fused[0] if fused else (None, 0.0)
+            if fused and score >= self.similarity_threshold:
+                results.append((self.corpus.answer(best_match_index), score, latencies))
+            else:
+                results.append(
+                    (
+                        (
+                            "Не удалось найти подходящий ответ на ваш вопрос.",
+                            ["no_files"],
+                        ),
+                        score,
+                        latencies,
+                    )
+                )
+        return results
+
+    def get_answers(self, questions):
+        """
+        Получает ответы на вопросы в том же формате, что и отдельные модели.
+
+        Параметры:
+        questions: Список вопросов, на которые нужно получить ответы.
+
+        Возвращает:
+        Список пар (ответ, итоговый балл) для каждого вопроса. Балл лежит в [0, 1];
+        ниже similarity_threshold возвращается заглушка, как у отдельных моделей.
+        """
+        return [
+            (answer, score)
+            for answer, score, _ in self.get_answers_with_latency(questions)
+        ]
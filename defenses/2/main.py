@@ -2,9 +2,10 @@ import os
 import response_model as model
 import metrics  # Import the metrics module
 import tree_builder
+from corpus_store import CorpusStore
 
-# Build the decision tree
-decision_tree = tree_builder.build_decision_tree("./KnowledgeBase")
+# Build the decision tree and pack it into a compact corpus shared by the models
+corpus = CorpusStore.from_tree(tree_builder.build_decision_tree("./KnowledgeBase"))
 
 # Load questions from the file
 questions_pull = []
@@ -14,7 +15,7 @@ with open("questions.txt", "r", encoding="utf-8") as file:
         questions_pull.append(i.strip().split("|")[1])
 
 # Instantiate the ResponseModel
-response_model = model.ResponseModel(decision_tree)
+response_model = model.ResponseModel(corpus)
 
 # Load ground truths (correct answers) from a file with '------' as a separator
 ground_truths = []
@@ -1,6 +1,7 @@
 import os
 import json
 from sentence_transformers import SentenceTransformer, util
+from corpus_store import CorpusStore
 
 
 class ResponseModel:
@@ -14,9 +15,10 @@ class ResponseModel:
         Инициализирует модель ответов.
 
         Параметры:
-        decision_tree: Дерево решений, содержащее ответы и описание условий для их выбора.
+        decision_tree: Дерево решений, содержащее ответы и описание условий для их выбора,
+        или уже построенный CorpusStore, общий для нескольких моделей.
         """
-        self.decision_tree = decision_tree
+        self.corpus = CorpusStore.ensure(decision_tree)
         # Загружаем threshold из файла конфигурации
         if os.path.exists(config_path):
             with open(config_path, "r") as config_file:
@@ -28,40 +30,27 @@ class ResponseModel:
             # Если файл не найден
             print(f"Configuration file {config_path} not found. Using default value.")
             self.similarity_threshold = 0.60
-        self.flat_structure, self.answers = self.flatten_tree(decision_tree)
         # Инициализация модели SBERT с поддержкой русского языка
         self.sbert_model = SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
         # Генерация эмбеддингов для всех элементов плоской структуры
         self.embeddings = self.sbert_model.encode(
-            self.flat_structure, convert_to_tensor=True
+            list(self.corpus.documents()), convert_to_tensor=True
         )
 
-    def flatten_tree(self, node, path=""):
+    def get_ranking(self, question, top_k=10):
         """
-        Рекурсивно преобразует дерево решений в плоскую структуру.
+        Ранжирует листья корпуса по семантической близости к вопросу.
 
         Параметры:
-        node: Текущий узел дерева (может быть словарем или кортежем).
-        path: Путь к текущему узлу (для отслеживания иерархии).
+        question: Вопрос пользователя.
+        top_k: Количество лучших совпадений.
 
         Возвращает:
-        Два списка: плоскую структуру узлов + ответов и ответы.
+        Список пар (id листа в корпусе, сходство) по убыванию сходства.
         """
-        if isinstance(node, dict):
-            result = []
-            answers = []
-            for key, value in node.items():
-                new_path = f"{path} {key}" if path else key
-                flattened_result, flattened_answers = self.flatten_tree(value, new_path)
-                result.extend(flattened_result)
-                answers.extend(flattened_answers)
-            return result, answers
-        elif isinstance(node, tuple):  # Если узел - это ответ
-            description, _ = node
-            answer = node
-            return [f"{path} {description}"], [answer]
-        else:
-            return [], []
+        question_embedding = self.sbert_model.encode(question, convert_to_tensor=True)
+        hits = util.semantic_search(question_embedding, self.embeddings, top_k=top_k)
+        return [(hit["corpus_id"], float(hit["score"])) for hit in hits[0]]
 
     def get_answers(self, questions):
         """
@@ -75,24 +64,18 @@ class ResponseModel:
         """
         results = []
         for question in questions:
-            # Генерация эмбеддинга для вопроса
-            question_embedding = self.sbert_model.encode(
-                question, convert_to_tensor=True
-            )
-            # Выполнение семантического поиска
-            hits = util.semantic_search(question_embedding, self.embeddings, top_k=1)
-            # Получение лучшего совпадения
-            best_match = hits[0][0]  # Первый результат (наиболее похожий)
-            best_match_index = best_match["corpus_id"]
-            similarity_score = best_match["score"]
-
-            # Сохранение ответа
-            results.append(
-                (self.answers[best_match_index], similarity_score)
-                if similarity_score >= self.similarity_threshold
-                else (
-                    ("Не удалось найти подходящий ответ на ваш вопрос.", ["no_files"]),
-                    similarity_score,
+            # Лучшее совпадение из общего ранжирования
+            best_match_index, similarity_score = self.get_ranking(question, 1)[0]
+            if similarity_score >= self.similarity_threshold:
+                results.append((self.corpus.answer(best_match_index), similarity_score))
+            else:
+                results.append(
+                    (
+                        (
+                            "Не удалось найти подходящий ответ на ваш вопрос.",
+                            ["no_files"],
+                        ),
+                        similarity_score,
+                    )
                 )
-            )
         return results
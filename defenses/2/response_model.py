@@ -7,6 +7,7 @@ import nltk
 from nltk.corpus import stopwords
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from corpus_store import CorpusStore
 
 
 nltk.download("stopwords")
@@ -24,10 +25,11 @@ class ResponseModel:
         Инициализирует модель ответов.
 
         Параметры:
-        decision_tree: Дерево решений, содержащее ответы и описание условий для их выбора.
+        decision_tree: Дерево решений, содержащее ответы и описание условий для их выбора,
+        или уже построенный CorpusStore, общий для нескольких моделей.
         lemmatization: Флаг, указывающий, нужно ли использовать лемматизацию.
         """
-        self.decision_tree = decision_tree
+        self.corpus = CorpusStore.ensure(decision_tree)
         # Загружаем threshold из файла конфигурации
         # Проверка наличия файла конфигурации
         if os.path.exists(config_path):
@@ -43,39 +45,11 @@ class ResponseModel:
         self.lemmatization = lemmatization
         self.stop_words = set(stopwords.words("russian"))
         self.morph = pymorphy3.MorphAnalyzer() if lemmatization else None
-        self.flat_structure, self.answers = self.flatten_tree(decision_tree)
-        self.flat_structure = [
-            self.preprocess_text(item) for item in self.flat_structure
-        ]
         self.vectorizer = TfidfVectorizer()
-        self.tfidf_matrix = self.vectorizer.fit_transform(self.flat_structure)
-
-    def flatten_tree(self, node, path=""):
-        """
-        Рекурсивно преобразует дерево решений в плоскую структуру.
-
-        Параметры:
-        node: Текущий узел дерева (может быть словарем или кортежем).
-        path: Путь к текущему узлу (для отслеживания иерархии).
-
-        Возвращает:
-        Два списка: плоскую структуру узлов + ответов и ответы.
-        """
-        if isinstance(node, dict):
-            result = []
-            answers = []
-            for key, value in node.items():
-                new_path = f"{path} {key}" if path else key
-                flattened_result, flattened_answers = self.flatten_tree(value, new_path)
-                result.extend(flattened_result)
-                answers.extend(flattened_answers)
-            return result, answers
-        elif isinstance(node, tuple):  # Если узел - это ответ
-            description, _ = node
-            answer = node
-            return [f"{path} {description}"], [answer]
-        else:
-            return [], []
+        # Предобработанные тексты нужны только на время обучения векторизатора
+        self.tfidf_matrix = self.vectorizer.fit_transform(
+            self.preprocess_text(item) for item in self.corpus.documents()
+        )
 
     def preprocess_text(self, text):
         """
@@ -106,6 +80,22 @@ class ResponseModel:
             return " ".join(lem_words)
         return " ".join(filtered_words)
 
+    def get_ranking(self, question, top_k=10):
+        """
+        Ранжирует листья корпуса по косинусному сходству с вопросом.
+
+        Параметры:
+        question: Вопрос пользователя.
+        top_k: Количество лучших совпадений.
+
+        Возвращает:
+        Список пар (id листа в корпусе, сходство) по убыванию сходства.
+        """
+        vector_question = self.vectorizer.transform([self.preprocess_text(question)])
+        similarity = cosine_similarity(vector_question, self.tfidf_matrix).flatten()
+        top_indices = np.argsort(-similarity, kind="stable")[:top_k]
+        return [(int(index), float(similarity[index])) for index in top_indices]
+
     def get_answers(self, questions):
         """
         Получает ответы на заданные вопросы, используя косинусное сходство.
@@ -118,21 +108,18 @@ class ResponseModel:
         """
         results = []
         for question in questions:
-            # Обработка и векторизация вопроса
-            vector_question = self.vectorizer.transform(
-                [self.preprocess_text(question)]
-            )
-            # Вычисление косинусного сходства
-            similarity = cosine_similarity(vector_question, self.tfidf_matrix).flatten()
-            # Индекс наибольшего сходства
-            best_match_index = np.argmax(similarity)
-            # Сохранение ответа
-            results.append(
-                (self.answers[best_match_index], similarity[best_match_index])
-                if similarity[best_match_index] >= self.similarity_threshold
-                else (
-                    ("Не удалось найти подходящий ответ на ваш вопрос.", ["no_files"]),
-                    similarity[best_match_index],
+            # Лучшее совпадение из общего ранжирования
+            best_match_index, similarity_score = self.get_ranking(question, 1)[0]
+            if similarity_score >= self.similarity_threshold:
+                results.append((self.corpus.answer(best_match_index), similarity_score))
+            else:
+                results.append(
+                    (
+                        (
+                            "Не удалось найти подходящий ответ на ваш вопрос.",
+                            ["no_files"],
+                        ),
+                        similarity_score,
+                    )
                 )
-            )
         return results
@@ -2,6 +2,7 @@ import os
 import json
 from transformers import AutoTokenizer, AutoModel
 import torch
+from corpus_store import CorpusStore
 
 
 class ResponseModel:
@@ -15,9 +16,10 @@ class ResponseModel:
         Инициализирует модель ответов.
 
         Параметры:
-        decision_tree: Дерево решений, содержащее ответы и описание условий для их выбора.
+        decision_tree: Дерево решений, содержащее ответы и описание условий для их выбора,
+        или уже построенный CorpusStore, общий для нескольких моделей.
         """
-        self.decision_tree = decision_tree
+        self.corpus = CorpusStore.ensure(decision_tree)
 
         # Загружаем threshold из файла конфигурации
         if os.path.exists(config_path):
@@ -31,15 +33,12 @@ class ResponseModel:
             print(f"Configuration file {config_path} not found. Using default value.")
             self.similarity_threshold = 0.60
 
-        # Преобразование дерева решений в плоскую структуру
-        self.flat_structure, self.answers = self.flatten_tree(decision_tree)
-
         # Инициализация модели HuggingFace
         self.tokenizer = AutoTokenizer.from_pretrained("ai-forever/sbert_large_nlu_ru")
         self.model = AutoModel.from_pretrained("ai-forever/sbert_large_nlu_ru")
 
         # Генерация эмбеддингов для всех элементов плоской структуры
-        self.embeddings = self.generate_embeddings(self.flat_structure)
+        self.embeddings = self.generate_embeddings(list(self.corpus.documents()))
 
     def mean_pooling(self, model_output, attention_mask):
         """
@@ -82,45 +81,23 @@ class ResponseModel:
         )
         return sentence_embeddings
 
-    def flatten_tree(self, node, path=""):
+    def get_ranking(self, question, top_k=10):
         """
-        Рекурсивно преобразует дерево решений в плоскую структуру.
+        Ранжирует листья корпуса по косинусному сходству эмбеддингов с вопросом.
 
         Параметры:
-        node: Текущий узел дерева (может быть словарем или кортежем).
-        path: Путь к текущему узлу (для отслеживания иерархии).
+        question: Вопрос пользователя.
+        top_k: Количество лучших совпадений.
 
         Возвращает:
-        Два списка: плоскую структуру узлов + ответов и ответы.
-        """
-        if isinstance(node, dict):
-            result = []
-            answers = []
-            for key, value in node.items():
-                new_path = f"{path} {key}" if path else key
-                flattened_result, flattened_answers = self.flatten_tree(value, new_path)
-                result.extend(flattened_result)
-                answers.extend(flattened_answers)
-            return result, answers
-        elif isinstance(node, tuple):  # Если узел - это ответ
-            description, _ = node
-            answer = node
-            return [f"{path} {description}"], [answer]
-        else:
-            return [], []
-
-    def cosine_similarity(self, vec1, vec2):
+        Список пар (id листа в корпусе, сходство) по убыванию сходства.
         """
-        Вычисляет косинусное сходство между двумя векторами.
-
-        Параметры:
-        vec1: Первый вектор.
-        vec2: Второй вектор.
-
-        Возвращает:
-        Значение косинусного сходства.
-        """
-        return torch.nn.functional.cosine_similarity(vec1, vec2, dim=0)
+        question_embedding = self.generate_embeddings([question])
+        similarity = torch.nn.functional.cosine_similarity(
+            question_embedding, self.embeddings, dim=1
+        )
+        scores, indices = torch.topk(similarity, k=min(top_k, len(similarity)))
+        return list(zip(indices.tolist(), scores.tolist()))
 
     def get_answers(self, questions):
         """
@@ -134,23 +111,10 @@ class ResponseModel:
         """
         results = []
         for question in questions:
-            # Генерация эмбеддинга для вопроса
-            question_embedding = self.generate_embeddings([question])[0]
-
-            # Поиск наиболее похожего ответа
-            best_match_index = -1
-            best_similarity_score = -1
-            for i, embedding in enumerate(self.embeddings):
-                similarity_score = self.cosine_similarity(question_embedding, embedding)
-                if similarity_score > best_similarity_score:
-                    best_similarity_score = similarity_score
-                    best_match_index = i
-
-            # Сохранение ответа
-            if best_similarity_score >= self.similarity_threshold:
-                results.append(
-                    (self.answers[best_match_index], best_similarity_score.item())
-                )
+            # Лучшее совпадение из общего ранжирования
+            best_match_index, similarity_score = self.get_ranking(question, 1)[0]
+            if similarity_score >= self.similarity_threshold:
+                results.append((self.corpus.answer(best_match_index), similarity_score))
             else:
                 results.append(
                     (
@@ -158,8 +122,7 @@ class ResponseModel:
                             "Не удалось найти подходящий ответ на ваш вопрос.",
                             ["no_files"],
                         ),
-                        best_similarity_score.item(),
+                        similarity_score,
                     )
                 )
-
         return results
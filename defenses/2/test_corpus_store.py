@@ -0,0 +1,79 @@
+import pytest
+from corpus_store import CorpusStore
+
+
+def flatten_tree(node, path=""):
+    """Прежняя реализация flatten_tree из моделей ответов, эталон для сравнения."""
+    if isinstance(node, dict):
+        result = []
+        answers = []
+        for key, value in node.items():
+            new_path = f"{path} {key}" if path else key
+            flattened_result, flattened_answers = flatten_tree(value, new_path)
+            result.extend(flattened_result)
+            answers.extend(flattened_answers)
+        return result, answers
+    elif isinstance(node, tuple):
+        description, _ = node
+        return [f"{path} {description}"], [node]
+    else:
+        return [], []
+
+
+TREES = {
+    "nested": {
+        "Кредиты": {
+            "Каникулы": ("Как оформить кредитные каникулы?", ["/kb/Кредиты/a.docx"]),
+            "Пусто": {},
+            "Реструктуризация": ("Текст", ["/kb/b.docx", "/kb/c.jpg"]),
+        },
+        "Налоги": ("Вычет ё — 13%", ["no_files"]),
+    },
+    "root_tuple": ("desc", ["no_files"]),
+    "multibyte": {"日本": {"Ω": ("emoji 🙂 и кириллица", ["файл.docx"])}},
+    "empty": {},
+}
+
+
+@pytest.mark.parametrize("tree", TREES.values(), ids=TREES.keys())
+def test_matches_flatten_tree(tree):
+    documents, answers = flatten_tree(tree)
+    corpus = CorpusStore.from_tree(tree)
+
+    assert len(corpus) == len(documents)
+    assert list(corpus.documents()) == documents
+    assert [corpus.document(i) for i in range(len(corpus))] == documents
+    assert [corpus.answer(i) for i in range(len(corpus))] == [
+        (text, list(files)) for text, files in answers
+    ]
+
+
+def test_root_tuple_document_has_leading_separator():
+    corpus = CorpusStore.from_tree(TREES["root_tuple"])
+
+    assert corpus.document(0) == " desc"
+    assert corpus.path(0) == ""
+
+
+def test_path_and_empty_files():
+    corpus = CorpusStore.from_tree({"А": {"Б": ("текст", [])}})
+
+    assert corpus.path(0) == "А Б"
+    assert corpus.files(0) == []
+
+
+def test_ensure_reuses_store():
+    corpus = CorpusStore.from_tree(TREES["nested"])
+
+    assert CorpusStore.ensure(corpus) is corpus
+
+
+def test_nbytes_stays_near_raw_text():
+    tree = TREES["nested"]
+    corpus = CorpusStore.from_tree(tree)
+    documents, answers = flatten_tree(tree)
+    raw = sum(len(document.encode("utf-8")) for document in documents)
+    for _, files in answers:
+        raw += sum(len(file.encode("utf-8")) + 1 for file in files) - 1
+
+    assert corpus.nbytes == raw + 8 * (3 * len(corpus) + 1)
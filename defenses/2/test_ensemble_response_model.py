@@ -0,0 +1,151 @@
+import sys
+import pytest
+import ensemble_response_model
+from ensemble_response_model import BACKENDS, ResponseModel
+
+STUB_BACKEND = """
+class ResponseModel:
+    similarity_threshold = 0.5
+
+    def __init__(self, corpus, config_path):
+        self.corpus = corpus
+        self.rankings = {}
+
+    def get_ranking(self, question, top_k=10):
+        return self.rankings.get(question, [])[:top_k]
+"""
+
+TREE = {
+    "Кредиты": {
+        "Каникулы": ("Текст про каникулы", ["no_files"]),
+        "Ипотека": ("Текст про ипотеку", ["/kb/a.docx"]),
+    },
+    "Налоги": ("Текст про налоги", ["no_files"]),
+}
+
+FALLBACK = ("Не удалось найти подходящий ответ на ваш вопрос.", ["no_files"])
+
+
+@pytest.fixture
+def stub_backends(tmp_path, monkeypatch):
+    """Подменяет модули моделей ответов заглушками без sklearn и torch."""
+    for module in BACKENDS.values():
+        (tmp_path / f"{module}.py").write_text(STUB_BACKEND, encoding="utf-8")
+        sys.modules.pop(module, None)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield
+    for module in BACKENDS.values():
+        sys.modules.pop(module, None)
+
+
+@pytest.fixture
+def ensemble(stub_backends):
+    with ResponseModel(TREE) as model:
+        yield model
+
+
+def set_rankings(ensemble, question, **rankings):
+    for name, ranking in rankings.items():
+        ensemble.backends[name].rankings[question] = ranking
+
+
+def test_leaf_ranked_first_everywhere_scores_one(ensemble):
+    ranking = [(1, 0.9), (0, 0.8), (2, 0.7)]
+    set_rankings(ensemble, "q", tfidf=ranking, bm25=ranking, sbert=ranking)
+
+    fused, _ = ensemble.search("q")
+
+    assert [leaf_id for leaf_id, _ in fused] == [1, 0, 2]
+    assert fused[0][1] == pytest.approx(1.0)
+    assert all(0 <= score <= 1 for _, score in fused)
+
+
+def test_rrf_orders_by_agreement(ensemble):
+    set_rankings(
+        ensemble,
+        "q",
+        tfidf=[(0, 0.9), (1, 0.8)],
+        bm25=[(1, 0.9), (0, 0.8)],
+        sbert=[(1, 0.9), (2, 0.8)],
+    )
+
+    fused, _ = ensemble.search("q")
+
+    assert [leaf_id for leaf_id, _ in fused] == [1, 0, 2]
+    assert fused[2][1] == pytest.approx(61 / 62 / 3)
+
+
+def test_hits_below_backend_threshold_are_dropped(ensemble):
+    set_rankings(
+        ensemble,
+        "q",
+        tfidf=[(2, 0.4), (0, 0.3)],
+        bm25=[(0, 0.9), (2, 0.1)],
+        sbert=[(0, 0.6)],
+    )
+
+    fused, _ = ensemble.search("q")
+
+    assert [leaf_id for leaf_id, _ in fused] == [0]
+    assert fused[0][1] == pytest.approx(2 / 3)
+
+
+def test_fallback_when_nothing_passes(ensemble):
+    set_rankings(ensemble, "q", tfidf=[(0, 0.1)], bm25=[(1, 0.2)], sbert=[])
+
+    [(answer, score, _)] = ensemble.get_answers_with_latency(["q"])
+
+    assert answer == FALLBACK
+    assert score == 0.0
+
+
+def test_fallback_below_ensemble_threshold(ensemble):
+    set_rankings(ensemble, "q", tfidf=[(2, 0.9)])
+
+    [(answer, score)] = ensemble.get_answers(["q"])
+
+    assert answer == FALLBACK
+    assert score == pytest.approx(1 / 3)
+
+
+def test_answer_and_latencies(ensemble):
+    set_rankings(ensemble, "q", tfidf=[(1, 0.9)], bm25=[(1, 0.9)])
+
+    [(answer, score, latencies)] = ensemble.get_answers_with_latency(["q"])
+
+    assert answer == ("Текст про ипотеку", ["/kb/a.docx"])
+    assert score == pytest.approx(2 / 3)
+    assert set(latencies) == {"tfidf", "bm25", "sbert", "total"}
+    assert all(value >= 0 for value in latencies.values())
+
+
+@pytest.mark.parametrize(
+    "backends, message",
+    [((), "at least one backend"), (("tfidf", "nope"), "Unknown backends")],
+)
+def test_invalid_backends(stub_backends, backends, message):
+    with pytest.raises(ValueError, match=message):
+        ResponseModel(TREE, backends=backends)
+
+
+def test_executor_shut_down_when_backend_fails(stub_backends, monkeypatch):
+    shutdowns = []
+    original = ensemble_response_model.ThreadPoolExecutor.shutdown
+
+    def shutdown(self, *args, **kwargs):
+        shutdowns.append(kwargs)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(
+        ensemble_response_model.ThreadPoolExecutor, "shutdown", shutdown
+    )
+    import response_model
+
+    def broken(self, corpus, config_path):
+        raise RuntimeError("model download failed")
+
+    monkeypatch.setattr(response_model.ResponseModel, "__init__", broken)
+
+    with pytest.raises(RuntimeError, match="download failed"):
+        ResponseModel(TREE)
+    assert shutdowns == [{"cancel_futures": True}]